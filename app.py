@@ -5,7 +5,7 @@
 # ✅ Restore UI
 # ✅ Progress tracking
 # ✅ Size & file statistics
-# ✅ Hash verification
+# ✅ Hash verification (blake3 / blake2b / sha256)
 # ✅ Ignore rules
 # ✅ Profiles
 # ✅ ZIP / TAR archives
@@ -16,17 +16,53 @@
 # ✅ Browse-and-add folder picker
 
 import os
+import sys
 import hashlib
 import shutil
 import json
+import io
+import stat
+import mmap
+import ctypes
+import threading
+import contextlib
+import itertools
+import time
 import gradio as gr
 import zipfile
 import tarfile
 import fnmatch
+import re
 import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 # ==================================================
 # CONFIG FILES
 # ==================================================
@@ -37,6 +73,60 @@ IGNORE_FILE = "ignore_patterns.txt"
 
 DEFAULT_IGNORE = ["*.tmp", "*.log", "*.cache", "__pycache__", ".git", ".venv"]
 
+# archive type -> file extension; zstd variants only when the codec is available
+ARCHIVE_TYPES = {"none": None, "zip": "zip", "zip-store": "zip", "tar": "tar", "tar.gz": "tar.gz"}
+if hasattr(zipfile, "ZIP_ZSTANDARD"):
+    ARCHIVE_TYPES["zip-zstd"] = "zip"
+if zstandard:
+    ARCHIVE_TYPES["tar.zst"] = "tar.zst"
+
+ARCHIVE_HELP = (
+    "zip: deflate level 1. zip-store: no compression, fastest, and best for "
+    "model weights (.safetensors/.ckpt/.bin) that don't compress anyway. "
+    "zip-zstd / tar.zst: zstandard, when available."
+)
+
+# Change-detection fingerprints. blake3 (pip install blake3) is the fastest;
+# stdlib blake2b-128 is the fallback.
+# The stdlib entries copy a pre-built empty hasher, which is cheaper than
+# constructing (and, for blake2b, parsing parameters) once per small file.
+_SHA256_TEMPLATE = hashlib.sha256()
+_BLAKE2B_TEMPLATE = hashlib.blake2b(digest_size=16)
+HASHERS = {
+    "sha256": _SHA256_TEMPLATE.copy,
+    "blake2b": _BLAKE2B_TEMPLATE.copy,
+}
+if blake3:
+    HASHERS["blake3"] = blake3.blake3
+if xxhash:
+    HASHERS["xxh3_128"] = xxhash.xxh3_128
+HASH_ALGO = "blake3" if blake3 else "blake2b"
+# files up to this size skip the streaming copy machinery (see copy_small)
+SMALL_FILE_MAX = 64*1024
+# when archiving, files up to this size are buffered so only the archive write is serialized
+ARCHIVE_BUFFER_MAX = 1024*1024
+# files at least this big are tree-hashed by blake3 across all cores, one at a time,
+# in chunks large enough for blake3 to split across its threads
+TREE_HASH_MIN = 16*1024*1024
+TREE_HASH_BUFSIZE = 8*1024*1024
+
+# verify mode -> fingerprint algorithm; None trusts size + mtime alone
+VERIFY_ALGOS = {
+    "none": None,
+    "fast": "xxh3_128" if xxhash else HASH_ALGO,
+    "full": "blake3" if blake3 else "sha256",
+    "sha256": "sha256",
+}
+# these modes re-hash every file, even when size + mtime match (like rsync -c)
+CHECKSUM_MODES = {"full", "sha256"}
+VERIFY_HELP = (
+    "none: no hashing, changes are detected by size + mtime only. "
+    "fast: same size + mtime check; only changed files are fingerprinted (xxh3/blake2b). "
+    "full / sha256: every file is re-hashed (blake3 or sha256 / always SHA-256) and "
+    "copied again if its content differs from the last backup, even when size and "
+    "mtime match. Only these two detect silent changes; use them for integrity auditing."
+)
+
 PINOKIO_PRESETS = {
     "Models": "models",
     "LoRAs": "models/loras",
@@ -50,27 +140,332 @@ PINOKIO_PRESETS = {
 # UTILITIES
 # ==================================================
 
-def sha256(path, chunk=1024*1024):
-    h = hashlib.sha256()
+MMAP_HASH_MIN = 4*1024*1024
+
+# hashlib.file_digest (Python 3.11+) runs the read/update loop in C
+_file_digest = getattr(hashlib, "file_digest", None)
+
+
+def fingerprint(path, algo=HASH_ALGO, chunk=256*1024, max_threads=1):
+    """Return "<algo>:<hexdigest>" for the file at path.
+
+    With blake3 and max_threads != 1 the file is memory-mapped and hashed by
+    blake3's own thread pool; only worth it for large files.
+    """
+    if algo == "blake3" and max_threads != 1:
+        return f"blake3:{blake3.blake3(max_threads=max_threads).update_mmap(path).hexdigest()}"
+    new = HASHERS[algo]
     with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MMAP_HASH_MIN:
+            # hash straight from the page cache instead of copying into Python buffers
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h = new()
+                h.update(mm)
+            return f"{algo}:{h.hexdigest()}"
+        if _file_digest:
+            return f"{algo}:{_file_digest(f, new).hexdigest()}"
+        h = new()
         while True:
             b = f.read(chunk)
             if not b:
                 break
             h.update(b)
-    return h.hexdigest()
+    return f"{algo}:{h.hexdigest()}"
+
+
+def _tagged(digest):
+    # state written before fingerprints were tagged holds bare sha256 hex
+    if digest and ":" not in digest:
+        return "sha256:" + digest
+    return digest
+
+
+def _matches(path, prev_hash, algo, h):
+    """Whether path still has the content prev_hash ("algo:hex") was taken from.
+
+    h is path's digest in algo (None if not hashed). A prev_hash made by another
+    available algorithm (another verify mode, or sha256 from old state) is
+    compared by re-fingerprinting path with that algorithm.
+    """
+    if not prev_hash or not h:
+        return False
+    prev_algo = prev_hash.split(":", 1)[0]
+    if prev_algo == algo:
+        return h == prev_hash
+    return prev_algo in HASHERS and fingerprint(path, prev_algo) == prev_hash
+
+
+def _same_file(prev, path):
+    # records carry their source path at index 3; inode numbers are reused after a
+    # delete, so a record stored for another path describes a different file.
+    # Older records (strings, 3-item lists) were keyed by path and always match.
+    return not (isinstance(prev, list) and len(prev) > 3 and prev[3] != path)
+
+
+_COPY_BUFSIZE = 1024*1024
+
+
+def fingerprints(path, algos, bufsize=_COPY_BUFSIZE):
+    """Return {algo: "algo:hex"} for several algorithms from a single read of path."""
+    hs = {a: HASHERS[a]() for a in algos}
+    mv = memoryview(bytearray(bufsize))
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(mv):
+            for h in hs.values():
+                h.update(mv[:n])
+    return {a: f"{a}:{h.hexdigest()}" for a, h in hs.items()}
+
+
+# copy-on-write clones: ioctl(FICLONE) on Linux (btrfs, xfs, bcachefs),
+# clonefile(2) on macOS (APFS)
+_FICLONE = 0x40049409
+_clonefile = None
+if sys.platform == "darwin":
+    try:
+        _clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        _clonefile = None
+
+
+def _reflink(src, dst):
+    """Clone src to dst (shared extents, no data moved); return True on success.
+
+    Returns False when the platform has no clone call or the filesystem refuses
+    (different filesystems, not copy-on-write); dst is then left for a normal copy.
+    A clone is byte-identical to a copy, so a stored hash stays valid.
+    """
+    if _clonefile:
+        if os.path.lexists(dst):
+            os.unlink(dst)  # clonefile(2) won't replace an existing file
+        return _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            return False  # EXDEV / EOPNOTSUPP / EINVAL
+
+
+def _fastcopy(src, dst):
+    """Copy file contents (not metadata) from src to dst, trying _reflink first."""
+    if not _reflink(src, dst):
+        _kernel_copy(src, dst)
+
+
+def _kernel_copy(src, dst):
+    """Copy file contents without going through Python buffers where possible.
+
+    On Linux this tries copy_file_range (which can itself reflink on newer
+    kernels), then sendfile, then a readinto loop over a reused 1 MiB buffer.
+    Elsewhere shutil.copyfile already uses fcopyfile (macOS) / CopyFile2 (Windows).
+    """
+    if not sys.platform.startswith("linux"):
+        shutil.copyfile(src, dst)
+        return
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(infd).st_size
+        copied = 0
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < size:
+                    n = os.copy_file_range(infd, outfd, size - copied)
+                    if not n:
+                        break
+                    copied += n
+            except OSError:
+                pass  # e.g. EXDEV on older kernels or an unsupported filesystem
+        if copied < size:
+            try:
+                while copied < size:
+                    n = os.sendfile(outfd, infd, copied, size - copied)
+                    if not n:
+                        break
+                    copied += n
+            except OSError:
+                pass
+        if copied < size:
+            fsrc.seek(copied)
+            fdst.seek(copied)
+            mv = memoryview(bytearray(_COPY_BUFSIZE))
+            while True:
+                n = fsrc.readinto(mv)
+                if not n:
+                    break
+                fdst.write(mv[:n])
+
+
+class _TeeReader(io.RawIOBase):
+    """Readable wrapper that mirrors to `out` (and hashes, if h is given) every byte read from `f`."""
+
+    def __init__(self, f, h, out):
+        self._f, self._h, self._out = f, h, out
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self._f.readinto(b)
+        if n:
+            chunk = memoryview(b)[:n]
+            if self._h:
+                self._h.update(chunk)
+            self._out.write(chunk)
+        return n
+
+
+@contextlib.contextmanager
+def open_archive(path, archive_type):
+    if archive_type == "zip":
+        # level 1: most of the ratio of the default level 6 at a fraction of the CPU
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+            yield z
+    elif archive_type == "zip-store":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as z:
+            yield z
+    elif archive_type == "zip-zstd":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_ZSTANDARD) as z:
+            yield z
+    elif archive_type == "tar.zst":
+        cctx = zstandard.ZstdCompressor(level=3)
+        with open(path, "wb") as raw, cctx.stream_writer(raw) as zw, \
+                tarfile.open(fileobj=zw, mode="w|", bufsize=1024*64) as t:
+            yield t
+    else:
+        # streaming modes: entries are only ever appended, so no seekable bookkeeping is needed
+        mode_tar = "w|gz" if archive_type == "tar.gz" else "w|"
+        with tarfile.open(str(path), mode_tar, bufsize=1024*64) as t:
+            yield t
+
+
+def _add_to_archive(archive, arcname, fi, reader, bufsize, size=None):
+    # same per-entry metadata as ZipFile.write / TarFile.add, but the data comes from reader;
+    # size overrides the stat size when the data was already read into memory
+    if isinstance(archive, zipfile.ZipFile):
+        zinfo = zipfile.ZipInfo.from_file(fi.name, arcname)
+        zinfo.compress_type = archive.compression
+        zinfo._compresslevel = archive.compresslevel
+        with archive.open(zinfo, "w", force_zip64=zinfo.file_size >= zipfile.ZIP64_LIMIT) as zf:
+            shutil.copyfileobj(reader, zf, bufsize)
+    else:
+        tarinfo = archive.gettarinfo(arcname=arcname, fileobj=fi)
+        if size is not None:
+            tarinfo.size = size
+        archive.addfile(tarinfo, reader)
+
+
+def copy_and_hash(src, dst, bufsize=_COPY_BUFSIZE, archive=None, arcname=None, algo=HASH_ALGO,
+                  max_threads=1):
+    """Copy src to dst and return its fingerprint, reading the source only once.
+
+    algo=None copies without hashing and returns None.
+    If an open zip/tar `archive` is given, the same bytes are also written to it
+    as `arcname`. Archives are not thread-safe: callers must serialize those calls.
+    blake3 with max_threads != 1 hashes each (large) chunk on blake3's own
+    thread pool, still within the single read.
+    Without an archive a reflink is tried first: if the filesystem clones the
+    file, no data is copied and the source is read once, for the hash only.
+    """
+    if archive is None:
+        if _reflink(src, dst):
+            return fingerprint(src, algo, max_threads=max_threads) if algo else None
+        if algo is None:
+            _kernel_copy(src, dst)
+            return None
+    if algo == "blake3" and max_threads != 1:
+        h = blake3.blake3(max_threads=max_threads)
+        bufsize = max(bufsize, TREE_HASH_BUFSIZE)
+    else:
+        h = HASHERS[algo]() if algo else None
+    with open(src, "rb", buffering=0) as fi, open(dst, "wb", buffering=0) as fo:
+        if archive is not None:
+            _add_to_archive(archive, arcname, fi, _TeeReader(fi, h, fo), bufsize)
+        else:
+            mv = memoryview(bytearray(bufsize))
+            while n := fi.readinto(mv):
+                h.update(mv[:n])
+                fo.write(mv[:n])
+    return f"{algo}:{h.hexdigest()}" if h else None
+
+
+def copy_small(src, dst, st, algo=HASH_ALGO, archive=None, arcname=None, lock=None):
+    """Copy a small file with one read and one write and return its fingerprint.
+
+    st is the source's stat result; only mtime/atime and permission bits are
+    carried over (no flags or xattrs, unlike shutil.copystat).
+    If an open `archive` is given, the in-memory bytes are also added to it as
+    `arcname`; only that step holds `lock`.
+    """
+    with open(src, "rb") as f:
+        data = f.read()
+        with open(dst, "wb") as fo:
+            fo.write(data)
+        if archive is not None:
+            with lock:
+                _add_to_archive(archive, arcname, f, io.BytesIO(data), _COPY_BUFSIZE, len(data))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    if algo is None:
+        return None
+    h = HASHERS[algo]()
+    h.update(data)
+    return f"{algo}:{h.hexdigest()}"
+
+
+def make_parents(paths):
+    """Create the distinct parent directories of paths up front, shortest first.
+
+    Parents are shared by most files, so this is one makedirs per directory
+    instead of one per file, and each call only has to create the last level.
+    """
+    for d in sorted({os.path.dirname(p) for p in paths}, key=len):
+        os.makedirs(d, exist_ok=True)
 
 
 def load_json(path, default):
     if os.path.exists(path):
+        if orjson:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     return default
 
 
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+def save_json(path, data, compact=False):
+    """Atomically write data as JSON: a crash mid-write leaves the old file intact.
+
+    compact drops indentation (and uses orjson when installed), for the large
+    backup state; profiles stay indented and hand-editable.
+    """
+    # per-process/thread temp name, so a cron CLI run and the UI never share one
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if compact and orjson:
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                if compact:
+                    json.dump(data, f, separators=(",", ":"))
+                else:
+                    json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+        # data is on disk before the rename, so a power loss can't leave an empty file
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
 
 
 def load_ignore_patterns():
@@ -81,20 +476,49 @@ def load_ignore_patterns():
         return [l.strip() for l in f if l.strip()]
 
 
-def ignored(path, patterns):
-    return any(fnmatch.fnmatch(path.name, p) for p in patterns)
+def compile_ignore(patterns):
+    """Fold all ignore globs into one compiled regex matched against entry names."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    # fnmatch is case-insensitive on Windows (normcase); keep that behaviour
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags)
+
+
+def iter_files(src, ign_re):
+    """Yield a DirEntry for every file under src, pruning ignored directories.
+
+    Like os.walk, symlinked directories are not descended into and unreadable
+    directories are silently skipped.
+    """
+    stack = [str(src)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.is_dir():
+                    if not e.is_symlink() and not ign_re.match(e.name):
+                        stack.append(e.path)
+                else:
+                    yield e
 
 # ==================================================
 # BACKUP ENGINE
 # ==================================================
 
-def backup_engine(sources, destination, mode, archive_type, dry_run, progress=None):
+def backup_engine(sources, destination, mode, archive_type, dry_run, progress=None, verify="fast"):
     """
     sources: list of source directories (or single string)
     destination: single destination directory (string or Path)
+    verify: "none", "fast", "full" or "sha256", see VERIFY_ALGOS / VERIFY_HELP
     """
     state = load_json(STATE_FILE, {})
-    ignore = load_ignore_patterns()
+    algo = VERIFY_ALGOS[verify]
+    checksum = verify in CHECKSUM_MODES
+    ign_re = compile_ignore(load_ignore_patterns())
 
     now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     base = Path(destination)
@@ -102,75 +526,184 @@ def backup_engine(sources, destination, mode, archive_type, dry_run, progress=No
         base = base / now
     base.mkdir(parents=True, exist_ok=True)
 
-    copied = skipped = total = 0
-    written_files = []
+    copied = skipped = refreshed = total = 0
 
     # Normalize sources
     if isinstance(sources, str):
         sources = [sources]
     sources = [s for s in (sources or []) if s]
 
+    # phase 1: scan. The full work list gives an accurate progress denominator.
+    jobs = []
+    total_bytes = 0
+    seen = set()
     for src in sources:
         src = Path(src)
         if not src.exists():
             continue
-        for root, dirs, files in os.walk(src):
-            root = Path(root)
-            dirs[:] = [d for d in dirs if not ignored(Path(d), ignore)]
-            for f in files:
-                total += 1
-                file_path = root / f
-                if ignored(file_path, ignore):
-                    continue
-                rel = file_path.relative_to(src)
-                out = base / src.name / rel
-                out.parent.mkdir(parents=True, exist_ok=True)
-                key = str(file_path.resolve())
-                h = sha256(file_path)
-                if key in state and state[key] == h and out.exists():
-                    skipped += 1
-                    continue
-                if not dry_run:
-                    shutil.copy2(file_path, out)
-                state[key] = h
-                written_files.append(out)
-                copied += 1
-                if progress:
-                    progress(copied / max(total, 1))
+        out_root = base / src.name
+        src_abs = str(src.resolve())
+        prefix = len(os.path.join(str(src), ""))
+        for entry in iter_files(src, ign_re):
+            total += 1
+            if ign_re.match(entry.name):
+                continue
+            rel = entry.path[prefix:]
+            path = os.path.join(src_abs, rel)
+            # the stat is cached on the DirEntry, so the workers reuse it
+            st = entry.stat()
+            # key by device+inode; fall back to the absolute path where that is not
+            # unique: DirEntry on Windows reports st_ino 0, and hard links or bind
+            # mounts can show the same inode twice
+            key = f"{st.st_dev}:{st.st_ino}"
+            if not st.st_ino or key in seen:
+                key = path
+            seen.add(key)
+            prev = state.get(key)
+            if not _same_file(prev, path):
+                prev = None  # inode reused by another file
+            if prev is None and key != path:
+                # entry written when state was keyed by path
+                prev = state.pop(path, None)
+                if not _same_file(prev, path):
+                    prev = None
+            jobs.append((entry, out_root / rel, os.path.join(src.name, rel), key, prev, path))
+            total_bytes += st.st_size
+
+    if not dry_run:
+        make_parents(j[1] for j in jobs)
 
     archive_path = None
     if archive_type != "none" and not dry_run:
-        archive_path = base / f"backup_{now}.{archive_type}"
-        if archive_type == "zip":
-            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as z:
-                for f in written_files:
-                    z.write(f, arcname=f.relative_to(base))
+        archive_path = base / f"backup_{now}.{ARCHIVE_TYPES[archive_type]}"
+    archive_lock = threading.Lock()
+
+    def worker(job, hash_threads=1):
+        # runs in a pool thread: only touches the filesystem, never shared state
+        entry, out, arcname, key, prev, path = job
+        file_path = entry.path
+        # DirEntry caches its stat result (free on Windows, one syscall on POSIX)
+        st = entry.stat()
+        # state entries are [size, mtime_ns, "algo:digest", path]; prev has already
+        # been matched to this path during the scan. Old string entries force a rehash.
+        h = None
+        prev_hash = _tagged(prev[2] if isinstance(prev, list) else prev)
+        audited = False
+        if isinstance(prev, list) and prev[0:2] == [st.st_size, st.st_mtime_ns] and out.exists():
+            if not checksum:
+                return "skipped", key, [st.st_size, st.st_mtime_ns, prev[2], path]
+            # checksum mode: hash the source without copying; copy only on a mismatch
+            prev_algo = prev_hash.split(":", 1)[0] if prev_hash else None
+            if prev_hash is None:
+                # written by verify=none: nothing to audit against yet, so record a digest
+                h = fingerprint(file_path, algo, max_threads=hash_threads)
+                return "skipped", key, [st.st_size, st.st_mtime_ns, h, path]
+            if prev_algo != algo and prev_algo in HASHERS:
+                # digest from another mode/algorithm: compare in that one, store ours
+                digests = fingerprints(file_path, (algo, prev_algo))
+                h, same = digests[algo], digests[prev_algo] == prev_hash
+            else:
+                h = fingerprint(file_path, algo, max_threads=hash_threads)
+                same = h == prev_hash
+            if same:
+                return "skipped", key, [st.st_size, st.st_mtime_ns, h, path]
+            audited = True  # content differs from the last backup
+        # likely changed: hash while copying so the source is only read once
+        existed = out.exists()
+        if dry_run:
+            if h is None and algo:
+                h = fingerprint(file_path, algo, max_threads=hash_threads)
+        elif archive is not None and st.st_size <= ARCHIVE_BUFFER_MAX:
+            h = copy_small(file_path, out, st, algo, archive=archive, arcname=arcname, lock=archive_lock)
+        elif archive is not None:
+            # one archive stream: entries are written one file at a time
+            with archive_lock:
+                h = copy_and_hash(file_path, out, archive=archive, arcname=arcname, algo=algo)
+            shutil.copystat(file_path, out)
+        elif st.st_size <= SMALL_FILE_MAX:
+            h = copy_small(file_path, out, st, algo)
         else:
-            mode_tar = "w:gz" if archive_type == "tar.gz" else "w"
-            with tarfile.open(archive_path, mode_tar) as t:
-                for f in written_files:
-                    t.add(f, arcname=f.relative_to(base))
-
-    save_json(STATE_FILE, state)
-
-    return {"copied": copied, "skipped": skipped, "total": total, "archive": str(archive_path) if archive_path else None}
+            h = copy_and_hash(file_path, out, algo=algo, max_threads=hash_threads)
+            shutil.copystat(file_path, out)
+        record = [st.st_size, st.st_mtime_ns, h, path]
+        if not audited and existed and _matches(file_path, prev_hash, algo, h):
+            # content unchanged (e.g. touched file): the stat fields are refreshed,
+            # and outside a dry run the file was rewritten (and archived) anyway
+            return ("skipped" if dry_run else "refreshed"), key, record
+        return "copied", key, record
+
+    # blake3 already spreads one big file over every core, so those run
+    # one at a time on this thread once the pool has drained
+    pooled, serial = jobs, []
+    if algo == "blake3":
+        pooled = [j for j in jobs if j[0].stat().st_size < TREE_HASH_MIN]
+        serial = [j for j in jobs if j[0].stat().st_size >= TREE_HASH_MIN]
+
+    # hashers release the GIL on large buffers, so threads scale on hash+copy
+    with open_archive(archive_path, archive_type) if archive_path else contextlib.nullcontext() as archive, \
+            ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        # phase 2: process
+        results = itertools.chain(
+            pool.map(worker, pooled),
+            (worker(j, blake3.blake3.AUTO) for j in serial),
+        )
+        bytes_done = 0
+        last_tick = 0.0
+        # results are folded here on the calling thread, which keeps progress() Gradio-safe
+        try:
+            for job, (status, key, record) in zip(pooled + serial, results):
+                state[key] = record
+                if status == "skipped":
+                    skipped += 1
+                elif status == "refreshed":
+                    refreshed += 1
+                else:
+                    copied += 1
+                bytes_done += job[0].stat().st_size
+                # repainting the UI per file throttles the loop; update at most every 100 ms
+                if progress and time.monotonic() - last_tick > 0.1:
+                    progress(bytes_done / max(total_bytes, 1))
+                    last_tick = time.monotonic()
+        except BaseException:
+            # a failed file aborts the run: drop the queued jobs instead of
+            # copying them while the pool shuts down
+            pool.shutdown(cancel_futures=True)
+            raise
+        # the throttle can swallow the last ticks; finish the bar explicitly
+        if progress:
+            progress(1.0)
+
+    # a dry run copied nothing, so recording its sizes/mtimes would make the
+    # next real run skip files that were never backed up
+    if not dry_run:
+        save_json(STATE_FILE, state, compact=True)
+
+    return {"copied": copied, "skipped": skipped, "refreshed": refreshed, "total": total, "archive": str(archive_path) if archive_path else None}
 
 # ==================================================
 # RESTORE ENGINE
 # ==================================================
 
 def restore_backup(backup_folder, target_dir):
-    backup_folder = Path(backup_folder)
-    target_dir = Path(target_dir)
-    restored = 0
-    for root, _, files in os.walk(backup_folder):
-        for f in files:
-            src = Path(root)/f
-            rel = src.relative_to(backup_folder)
-            dst = target_dir / rel
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            restored +=1
+    backup_folder = str(backup_folder)
+    target_dir = str(target_dir)
+    jobs = [
+        (e.path, os.path.join(target_dir, os.path.relpath(e.path, backup_folder)))
+        for e in iter_files(backup_folder, compile_ignore([]))
+    ]
+    make_parents(dst for _, dst in jobs)
+
+    def worker(job):
+        src, dst = job
+        _fastcopy(src, dst)
+        shutil.copystat(src, dst)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        try:
+            restored = sum(1 for _ in pool.map(worker, jobs))
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
     return f"✅ Restored {restored} files"
 
 # ==================================================
@@ -233,7 +766,8 @@ Now supports selecting multiple source folders via the browse picker, with a sin
         save_profile_btn = gr.Button("💾 Save profile")
         profile_selector = gr.Dropdown(choices=list(profiles.keys()), label="Load profile")
         mode = gr.Radio(["flat","incremental"],value="incremental", label="Backup mode")
-        archive = gr.Radio(["none","zip","tar","tar.gz"],value="none", label="Archive")
+        archive = gr.Radio(list(ARCHIVE_TYPES),value="none", label="Archive", info=ARCHIVE_HELP)
+        verify = gr.Radio(list(VERIFY_ALGOS),value="fast", label="Verify", info=VERIFY_HELP)
         dry_run = gr.Checkbox(label="Dry run (no files written)")
         progress = gr.Progress()
         run_btn = gr.Button("🚀 Run Backup")
@@ -265,7 +799,7 @@ Now supports selecting multiple source folders via the browse picker, with a sin
         # When loading a profile, return sources list and single destination for the two UI components
         profile_selector.change(load_profile, profile_selector, [folder_list,dest_picker])
 
-        def run_backup_ui(srcs,dst,prof,mode,archive,dry):
+        def run_backup_ui(srcs,dst,prof,mode,archive,verify,dry):
             # Normalize sources
             if isinstance(srcs, str):
                 srcs = [srcs]
@@ -283,7 +817,7 @@ Now supports selecting multiple source folders via the browse picker, with a sin
             if not dest:
                 return "❌ Please select a destination folder"
             try:
-                stats = backup_engine(srcs,dest,mode,archive,dry, progress)
+                stats = backup_engine(srcs,dest,mode,archive,dry, progress, verify)
             except Exception as e:
                 return f"❌ Error: {e}"
 
@@ -291,11 +825,12 @@ Now supports selecting multiple source folders via the browse picker, with a sin
                 "✅ Backup complete\n"
                 f"Copied: {stats['copied']}\n"
                 f"Skipped: {stats['skipped']}\n"
+                f"Refreshed (rewritten, content unchanged): {stats['refreshed']}\n"
                 f"Total scanned: {stats['total']}\n"
                 f"Archive: {stats['archive']}"
             )
 
-        run_btn.click(run_backup_ui,[folder_list,dest_picker,profile_name,mode,archive,dry_run],output)
+        run_btn.click(run_backup_ui,[folder_list,dest_picker,profile_name,mode,archive,verify,dry_run],output)
 
     with gr.Tab("Restore"):
         restore_src_picker = gr.Textbox(label="Enter backup folder to restore (path)")
@@ -332,21 +867,22 @@ def cli():
     parser.add_argument("--sources",nargs="*",default=[])
     parser.add_argument("--dest", help="Backup destination (single folder)")
     parser.add_argument("--mode",default="incremental")
-    parser.add_argument("--archive",default="none")
+    parser.add_argument("--archive",default="none",choices=list(ARCHIVE_TYPES),help=ARCHIVE_HELP)
     parser.add_argument("--dry",action="store_true")
+    # scheduled runs default to the cheapest change detection
+    parser.add_argument("--verify",default="none",choices=list(VERIFY_ALGOS),help=VERIFY_HELP)
     parser.add_argument("--restore-src")
     parser.add_argument("--restore-dest")
 
     args = parser.parse_args()
 
     if args.backup:
-        stats = backup_engine(args.sources,args.dest,args.mode,args.archive,args.dry)
+        stats = backup_engine(args.sources,args.dest,args.mode,args.archive,args.dry,verify=args.verify)
         print(json.dumps(stats,indent=2))
     elif args.restore:
         print(restore_backup(args.restore_src,args.restore_dest))
 
 if __name__=="__main__":
-    import sys
     if len(sys.argv)>1:
         cli()
     else: